@@ -1,3 +1,4 @@
+import pytest
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -185,6 +186,29 @@ def test_overlapping_data():
     prod_data_clean, om_data_clean = utils.overlapping_data(prod_data_datena_d, om_data_datena_d, prod_col_dict, om_col_dict)
     
     assert len(prod_data_clean) == 1020 and len(om_data_clean) == 7
+
+
+def test_overlapping_data_single_row_sites():
+    # R1 has a single production row and a single ticket, R2 several production
+    # rows and a single ticket, R3 no tickets at all
+    prod_df = pd.DataFrame({'randid': ['R1', 'R2', 'R2', 'R2', 'R3'],
+                            'Date': pd.to_datetime(['2020-01-01 12:00',
+                                                    '2020-01-02 01:00',
+                                                    '2020-01-02 10:00',
+                                                    '2020-01-03 01:00',
+                                                    '2020-01-01 12:00'])})
+    om_df = pd.DataFrame({'randid': ['R1', 'R2'],
+                          'date_start': pd.to_datetime(['2020-01-01 11:00',
+                                                        '2020-01-02 05:00']),
+                          'date_end': pd.to_datetime(['2020-01-01 13:00',
+                                                      '2020-01-02 06:00'])})
+
+    prod_data_clean, om_data_clean = utils.overlapping_data(prod_df, om_df,
+                                                            prod_col_dict, om_col_dict)
+
+    assert prod_data_clean['randid'].tolist() == ['R1', 'R2', 'R2']
+    assert prod_data_clean['Date'].tolist() == list(prod_df['Date'].iloc[:3])
+    assert om_data_clean['randid'].tolist() == ['R1', 'R2']
     
 
 def test_iec_calc():
@@ -219,6 +243,35 @@ def test_iec_calc():
     assert prod_data_clean_iec.equals(prod_data_clean_iec_pick)
 
 
+def test_iec_calc_single_row_site():
+    # R2 has a single time-stamp, so it has no time-step and gets NaN
+    prod_df = pd.DataFrame({'randid': ['R1', 'R2', 'R1'],
+                            'Date': pd.to_datetime(['2020-01-01 00:00',
+                                                    '2020-01-01 00:00',
+                                                    '2020-01-01 01:00']),
+                            'Irradiance': [500., 800., 600.]})
+    meta_df = pd.DataFrame({'randid': ['R1', 'R2'],
+                            'DC_Size_kW': [100., 50.]})
+
+    prod_iec = utils.iec_calc(prod_df, prod_col_dict, meta_df, metad_col_dict, gi_ref=1000.)
+
+    np.testing.assert_allclose(prod_iec[prod_col_dict['baseline']].to_numpy(),
+                               [50., np.nan, 60.])
+
+
+def test_iec_calc_missing_site():
+    prod_df = pd.DataFrame({'randid': ['R1', 'R3', 'R1'],
+                            'Date': pd.to_datetime(['2020-01-01 00:00',
+                                                    '2020-01-01 00:00',
+                                                    '2020-01-01 01:00']),
+                            'Irradiance': [500., 800., 600.]})
+    meta_df = pd.DataFrame({'randid': ['R1', 'R2'],
+                            'DC_Size_kW': [100., 50.]})
+
+    with pytest.raises(KeyError, match='R3'):
+        utils.iec_calc(prod_df, prod_col_dict, meta_df, metad_col_dict, gi_ref=1000.)
+
+
 def test_prod_quant():
     
     #Prod data
@@ -245,6 +298,25 @@ def test_prod_quant():
     prod_data_quant_pick = pd.read_pickle(os.path.join(test_datadir, 'prod_data_quant_pick.pkl'))
     
     assert prod_data_quant.equals(prod_data_quant_pick)
+
+
+def test_prod_quant_interleaved_sites():
+    # R1 and R2 rows are interleaved; R3 has a single row, so it has no
+    # per-step energy and its comparison is NaN
+    prod_df = pd.DataFrame({'randid': ['R1', 'R2', 'R1', 'R3', 'R2'],
+                            'Energy': [10., 100., 15., 7., 130.],
+                            'IEC_pstep': [5., 20., 4., 2., 25.]})
+
+    prod_norm = utils.prod_quant(prod_df, prod_col_dict, comp_type='norm', ecumu=True)
+    prod_diff = utils.prod_quant(prod_df, prod_col_dict, comp_type='diff', ecumu=True)
+
+    assert prod_norm['randid'].tolist() == ['R1', 'R2', 'R1', 'R3', 'R2']
+    np.testing.assert_allclose(prod_norm[prod_col_dict['energy_pstep']].to_numpy(),
+                               [np.nan, np.nan, 5., np.nan, 30.])
+    np.testing.assert_allclose(prod_norm[prod_col_dict['compared']].to_numpy(),
+                               [np.nan, np.nan, 1.25, np.nan, 1.2])
+    np.testing.assert_allclose(prod_diff[prod_col_dict['compared']].to_numpy(),
+                               [np.nan, np.nan, -1., np.nan, -5.])
     
 def test_om_summary_stats():
     
@@ -272,3 +344,34 @@ def test_om_summary_stats():
     om_data_update = om_data_update.round({'EventDur':2})
     
     assert om_data_update.equals(om_data_update_pick)
+
+
+def test_om_summary_stats_tz_aware():
+    om_df = pd.DataFrame({'randid': ['R1', 'R1', 'R2'],
+                          'date_start': pd.to_datetime(['2020-01-02 05:00',
+                                                        '2020-02-01 00:00',
+                                                        '2020-03-01 00:00']).tz_localize('UTC')})
+    om_df['date_end'] = om_df['date_start'] + pd.Timedelta(hours=3)
+    meta_df = pd.DataFrame({'randid': ['R1', 'R2'],
+                            'COD': ['2019-01-01 10:00+00:00', '2019-06-01 00:00+00:00']})
+
+    om_data_update = utils.om_summary_stats(om_df, meta_df, om_col_dict, metad_col_dict)
+
+    assert ptypes.is_datetime64tz_dtype(om_data_update[metad_col_dict['COD']])
+    assert om_data_update[om_col_dict['agedatestart']].tolist() == [366, 396, 274]
+    assert om_data_update[om_col_dict['eventdur']].tolist() == [3., 3., 3.]
+
+
+def test_om_summary_stats_duplicate_meta_sites():
+    # R1 is listed twice in the metadata; its last commissioning date is used
+    om_df = pd.DataFrame({'randid': ['R1', 'R2', 'R1'],
+                          'date_start': pd.to_datetime(['2020-01-02',
+                                                        '2020-03-01',
+                                                        '2020-02-01'])})
+    om_df['date_end'] = om_df['date_start'] + pd.Timedelta(hours=3)
+    meta_df = pd.DataFrame({'randid': ['R1', 'R2', 'R1'],
+                            'COD': ['2018-01-01', '2019-06-01', '2019-01-01']})
+
+    om_data_update = utils.om_summary_stats(om_df, meta_df, om_col_dict, metad_col_dict)
+
+    assert om_data_update[om_col_dict['agedatestart']].tolist() == [366, 274, 396]
@@ -144,7 +144,6 @@ def visualize_attribute_timeseries(
         return out
 
     fig = plt.figure(figsize=figsize)
-    asset_set = list(set(df[LABEL_COLUMN].tolist()))
 
     dates = df[DATE_COLUMN].tolist()
     assets_list = df[LABEL_COLUMN].tolist()
@@ -167,12 +166,12 @@ def visualize_attribute_timeseries(
         index_sums += [dt] * len(alist)
         asset_sums += list(alist)
 
-    asset_set = list(set(asset_sums))
-
     newdf = pd.DataFrame()
     newdf[LABEL_COLUMN] = asset_sums
     newdf[DATE_COLUMN] = index_sums
 
+    asset_set = pd.unique(newdf[LABEL_COLUMN].to_numpy())
+
     cmap = plt.cm.get_cmap(cmap_name, len(asset_set))
 
     graphs = []
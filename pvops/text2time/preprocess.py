@@ -300,8 +300,6 @@ def prod_nadate_process(prod_df, prod_col_dict, pnadrop=False):
         by this function.
     """
 
-    prod_df = prod_df.copy()
-
     # creating local dataframes to not modify originals
     prod_df = prod_df.copy()
 
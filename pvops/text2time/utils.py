@@ -33,6 +33,7 @@ def iec_calc(prod_df, prod_col_dict, meta_df, meta_col_dict, gi_ref=1000.0):
     meta_df: DataFrame
         A data frame corresponding to site metadata.
         At the least, the columns in meta_col_dict be present.
+        Every site in prod_df must be present, otherwise a KeyError is raised.
 
     meta_col_dict: dict of {str : str}
         A dictionary that contains the column names relevant for the meta-data
@@ -52,7 +53,8 @@ def iec_calc(prod_df, prod_col_dict, meta_df, meta_col_dict, gi_ref=1000.0):
     DataFrame
         A data frame for production data with a new column, iecE,
         which is the predicted energy calculated based on the IEC standard
-        using measured irradiance data
+        using measured irradiance data. The time-step of each site is taken from
+        its first two time-stamps, so sites with a single time-stamp get NaN.
 
     """
     # assigning dictionary items to local variables for cleaner code
@@ -65,34 +67,40 @@ def iec_calc(prod_df, prod_col_dict, meta_df, meta_col_dict, gi_ref=1000.0):
     meta_site = meta_col_dict["siteid"]
     meta_size = meta_col_dict["dcsize"]
 
-    # creating local dataframes to not modify originals
+    # creating local dataframe to not modify original (meta_df is only read)
     prod_df = prod_df.copy()
-    meta_df = meta_df.copy()
 
     # setting index for metadata for alignment to production data
     meta_df = meta_df.set_index(meta_site)
 
     # Creating new column in production data corresponding to site size (in terms of KW)
-    prod_df[prod_dcsize] = prod_df.loc[:, prod_site].apply(
-        lambda x: meta_df.loc[x, meta_size]
-    )
+    prod_df[prod_dcsize] = prod_df[prod_site].map(meta_df[meta_size])
+
+    # sites absent from the metadata would silently get a NaN size from map,
+    # so they are reported the same way a failed label lookup would
+    missing_mask = prod_df[prod_dcsize].isna() & ~prod_df[prod_site].isin(meta_df.index)
+    if missing_mask.any():
+        missing_sites = list(prod_df.loc[missing_mask, prod_site].unique())
+        raise KeyError(f"Sites not found in meta_df: {missing_sites}")
 
     # iec calculation
 
-    for sid in prod_df.loc[:, prod_site].unique():
-        mask = prod_df.loc[:, prod_site] == sid
-        tstep = prod_df.loc[mask, prod_ts].iloc[1] - prod_df.loc[mask, prod_ts].iloc[0]
-        tstep = tstep / np.timedelta64(
-            1, "h"
-        )  # Converting the time-step to float (representing hours) to
-        # arrive at kWh for the iecE calculation
-
-        prod_df.loc[mask, prod_iec] = (
-            prod_df.loc[mask, prod_dcsize]
-            * prod_df.loc[mask, prod_irr]
-            * tstep
-            / gi_ref
-        )
+    # time-step of each site (difference between its first two time-stamps),
+    # broadcast to every row of that site in a single groupby pass
+    site_ts = prod_df.groupby(prod_site, sort=False)[prod_ts]
+    tstep = site_ts.diff().where(site_ts.cumcount() == 1)
+    tstep = tstep.groupby(prod_df[prod_site], sort=False).transform("first")
+    tstep = tstep / np.timedelta64(
+        1, "h"
+    )  # Converting the time-step to float (representing hours) to
+    # arrive at kWh for the iecE calculation
+
+    prod_df[prod_iec] = (
+        prod_df[prod_dcsize]
+        * prod_df[prod_irr]
+        * tstep
+        / gi_ref
+    )
     prod_df.drop(columns=[prod_dcsize], inplace=True)
 
     return prod_df
@@ -169,24 +177,18 @@ def summarize_overlaps(prod_df, om_df, prod_col_dict, om_col_dict):
     prod_site = prod_col_dict["siteid"]
     prod_ts = prod_col_dict["timestamp"]
 
-    # total number of OM events per site
-    num_om_events = om_df[[om_site, om_date_s]].groupby([om_site]).count()
-
-    # earliest dates of O&M events per site
-    min_date = om_df[[om_site, om_date_s]].groupby([om_site]).min()
-
-    # earliest dates of O&M events per site
-    max_date = om_df[[om_site, om_date_e]].groupby([om_site]).max()
-
-    # concatenating
-    om_output = pd.concat([min_date, max_date, num_om_events], axis=1)
-    om_output.columns = ["Earliest Event Start", "Latest Event End", "Total Events"]
+    # earliest start, latest end and total number of O&M events per site,
+    # aggregated from a single groupby
+    om_output = om_df.groupby(om_site).agg(
+        **{
+            "Earliest Event Start": (om_date_s, "min"),
+            "Latest Event End": (om_date_e, "max"),
+            "Total Events": (om_date_s, "count"),
+        }
+    )
 
     # production data timestep frequency in number of hours
-    prod_max_ts = prod_df[[prod_site, prod_ts]].groupby([prod_site]).size()
-    prod_act_ts = prod_df[[prod_site, prod_ts]].groupby([prod_site]).count()
-
-    prod_output = pd.concat([prod_act_ts, prod_max_ts], axis=1)
+    prod_output = prod_df.groupby(prod_site)[prod_ts].agg(["count", "size"])
     prod_output.columns = ["Actual # Time Stamps", "Max # Time Stamps"]
 
     return prod_output, om_output
@@ -210,6 +212,7 @@ def om_summary_stats(om_df, meta_df, om_col_dict, meta_col_dict):
 
     meta_df: DataFrame
         A data frame corresponding to the metadata that contains columns specified in meta_col_dict.
+        If a site-ID appears more than once, its last commissioning date is used.
 
     om_col_dict: dict of {str : str}
         A dictionary that contains the column names relevant for the O&M data which consist of
@@ -258,12 +261,9 @@ def om_summary_stats(om_df, meta_df, om_col_dict, meta_col_dict):
     meta_site = meta_col_dict["siteid"]
     meta_cod = meta_col_dict["COD"]
 
-    # creating local dataframes to not modify originals
-    meta_df = meta_df.copy()
-    om_df = om_df.copy()
-
-    # Setting randid as index
-    om_df.set_index(om_site, inplace=True)
+    # Setting randid as index (set_index returns a new frame, so the
+    # original is not modified)
+    om_df = om_df.set_index(om_site)
 
     # Calculating duration of repairs on OM data
     om_df[om_rep_dur] = om_df.loc[:][om_date_e] - om_df[:][om_date_s]
@@ -278,14 +278,15 @@ def om_summary_stats(om_df, meta_df, om_col_dict, meta_col_dict):
     # =========================================================================
     # Extracting commissioning dates of only the sites in the O&M data-frame
     # (in case meta_df has more sites)
-    cod_dates = pd.to_datetime(meta_df.loc[om_df.index.unique()][meta_cod].copy())
-
-    # Adding age column to om_df, but first initiating a COD column in the
-    # OM-data (using NANs) to be able to take the difference between two columns
-    om_df[meta_cod] = np.nan
-    for i in cod_dates.index:
-        om_df.loc[i, meta_cod] = cod_dates[i]
-    om_df[meta_cod] = pd.to_datetime(om_df[meta_cod])
+    cod_dates = pd.to_datetime(meta_df.loc[om_df.index.unique()][meta_cod])
+    # keeping only the last entry of duplicated site-IDs so the dates can be
+    # aligned to the O&M data by site
+    cod_dates = cod_dates[~cod_dates.index.duplicated(keep="last")]
+
+    # Adding age column to om_df, but first adding a COD column to the OM-data
+    # (commissioning dates aligned to every event's site in one reindex, rather
+    # than written site by site) to be able to take the difference between two columns
+    om_df[meta_cod] = cod_dates.reindex(om_df.index)
     om_df[meta_cod] = om_df[meta_cod].dt.floor("D")  # hour on commisioning data is
     # unimportant for this analysis
     om_df[om_age_st] = om_df.loc[:, om_date_s] - om_df.loc[:, meta_cod]
@@ -366,66 +367,58 @@ def overlapping_data(prod_df, om_df, prod_col_dict, om_col_dict):
     prod_site = prod_col_dict["siteid"]
     prod_ts = prod_col_dict["timestamp"]
 
-    # creating local dataframes to not modify originals
-    prod_df = prod_df.copy()
-    om_df = om_df.copy()
-
-    # setting randid as the index
+    # setting randid as the index (set_index returns new frames, so the
+    # originals are not modified)
     om_df = om_df.set_index(om_site)
     prod_df = prod_df.set_index(prod_site)
 
-    # initializing new dataframes
-    om_df_commondates = pd.DataFrame()
-    prod_df_commondates = pd.DataFrame()
+    # initializing lists of per-site overlapping sections, concatenated once
+    # after the loop instead of growing a DataFrame on every site
+    om_overlap_sections = []
+    prod_overlap_sections = []
+
+    # row positions of every site, gathered in one pass so that each site is
+    # selected positionally instead of through a label lookup on a non-unique index
+    prod_site_pos = prod_df.groupby(level=0, sort=False).indices
+    om_site_pos = om_df.groupby(level=0, sort=False).indices
 
     # finding overlapping DFs
     for rid in prod_df.index.unique():
-        if rid in om_df.index.unique():
+        if rid in om_site_pos:
+            # selecting with position arrays keeps DataFrames (not rows/scalars) even
+            # when a site has a single entry, so min/max stay vectorized reductions
+            om_rid = om_df.iloc[om_site_pos[rid]]
+            prod_rid = prod_df.iloc[prod_site_pos[rid]]
+            prod_rid_ts = prod_rid[prod_ts]
+
             # OM Keepers:
             # Only OM tickets that have: (1) an end-date greater than the
             # earliest perf-date AND (2) a start-date less than the last perf-date
-            omtail_gt_phead_mask = om_df.loc[rid, om_date_e] >= min(
-                prod_df.loc[rid][prod_ts]
-            )
-            omhead_lt_ptail_mask = om_df.loc[rid, om_date_s] <= max(
-                prod_df.loc[rid][prod_ts]
-            )
+            omtail_gt_phead_mask = om_rid[om_date_e] >= prod_rid_ts.min()
+            omhead_lt_ptail_mask = om_rid[om_date_s] <= prod_rid_ts.max()
 
             # Perf Keepers:
             # Only Perf data that has:  (1) a date greater than the START of
             # the earliest OM ticket AND (2) a date less than the END of the oldest OM ticket
-            if isinstance(pd.to_datetime(om_df.loc[rid][om_date_s]), pd.Series):
-                om_datestart_check = om_df.loc[rid][om_date_s]
-                om_dateend_check = om_df.loc[rid][om_date_e]
-            else:
-                om_datestart_check = [om_df.loc[rid][om_date_s]]
-                om_dateend_check = [om_df.loc[rid][om_date_e]]
-
             # To show production data for the full day if an event occurs
-            perf_gt_omhead_mask = prod_df.loc[rid][prod_ts].dt.ceil("D") >= min(
-                om_datestart_check
+            perf_gt_omhead_mask = prod_rid_ts.dt.ceil("D") >= om_rid[om_date_s].min()
+            perf_lt_omtail_mask = prod_rid_ts.dt.floor("D") <= om_rid[om_date_e].max()
+
+            # Creating NEW DataFrames using masks generated above
+            om_overlap_sections.append(
+                om_rid[(omtail_gt_phead_mask) & (omhead_lt_ptail_mask)]
             )
-            perf_lt_omtail_mask = prod_df.loc[rid][prod_ts].dt.floor("D") <= max(
-                om_dateend_check
+            prod_overlap_sections.append(
+                prod_rid[(perf_gt_omhead_mask) & (perf_lt_omtail_mask)]
             )
 
-            # Creating NEW DataFrames using masks generated above and concatenate to
-            # "_commondates" DFs
-            if isinstance(pd.to_datetime(om_df.loc[rid][om_date_s]), pd.Series):
-                om_overlap_section = om_df.loc[rid][
-                    (omtail_gt_phead_mask) & (omhead_lt_ptail_mask)
-                ]
-                om_df_commondates = pd.concat([om_df_commondates, om_overlap_section])
-            else:
-                om_overlap_section = om_df.loc[[rid]][
-                    [(omtail_gt_phead_mask) & (omhead_lt_ptail_mask)]
-                ]
-                om_df_commondates = pd.concat([om_df_commondates, om_overlap_section])
-
-            perf_overlap_section = prod_df.loc[rid][
-                (perf_gt_omhead_mask) & (perf_lt_omtail_mask)
-            ]
-            prod_df_commondates = pd.concat([prod_df_commondates, perf_overlap_section])
+    # concatenating sections of all sites into the "_commondates" DFs
+    if prod_overlap_sections:
+        om_df_commondates = pd.concat(om_overlap_sections)
+        prod_df_commondates = pd.concat(prod_overlap_sections)
+    else:
+        om_df_commondates = pd.DataFrame()
+        prod_df_commondates = pd.DataFrame()
 
     # resetting index of DFs before return
     prod_df_commondates.reset_index(inplace=True)
@@ -487,14 +480,17 @@ def prod_anomalies(prod_df, prod_col_dict, minval=1.0, repval=np.nan, ffill=True
 
     prod_df = prod_df.copy()
     mask = prod_df.loc[:, prod_ener] < minval
-    maskna = prod_df.loc[:, prod_ener].isna()
-    addressed = prod_df[mask]
-    addressedwna = prod_df[mask | maskna]
+
+    # only the rows actually reported are sliced out; NANs are addressed too
+    # when they get forward-filled
+    if ffill:
+        addressed = prod_df[mask | prod_df.loc[:, prod_ener].isna()]
+    else:
+        addressed = prod_df[mask]
     prod_df.loc[mask, prod_ener] = repval
 
     if ffill:
         prod_df.loc[:, prod_ener].fillna(method="ffill", inplace=True)
-        addressed = addressedwna
 
     return prod_df, addressed
 
@@ -550,26 +546,23 @@ def prod_quant(prod_df, prod_col_dict, comp_type, ecumu=True):
     quant_ener = prod_col_dict["compared"]
     pstep_ener = prod_col_dict["energy_pstep"]
 
-    # creating local dataframes to not modify originals
-    prod_df = prod_df.copy()
-    prod_df.set_index(prod_site, inplace=True)
+    # adding per timestep column for energy production if energy format is cumulative
+    # (differences are taken within each site in a single groupby pass, while rows
+    # still have their original index, and attached by position below)
+    if ecumu:
+        pstep = prod_df.groupby(prod_site, sort=False)[prod_ener].diff()
+    else:
+        pstep = prod_df[prod_ener]
 
-    for rid in prod_df.index.unique():
-        # adding per timestep column for energy production if energy format is cumulative
-        if ecumu:
-            prod_df.loc[rid, pstep_ener] = prod_df.loc[rid, prod_ener].diff()
-        else:
-            prod_df.loc[rid, pstep_ener] = prod_df.loc[rid, prod_ener]
-
-        if comp_type == "diff":
-            prod_df.loc[rid, quant_ener] = (
-                prod_df.loc[rid, baseline_ener] - prod_df.loc[rid, pstep_ener]
-            )
+    # creating local dataframe (indexed by site) to not modify original
+    prod_df = prod_df.set_index(prod_site)
+    prod_df[pstep_ener] = pstep.to_numpy()
 
-        elif comp_type == "norm":
-            prod_df.loc[rid, quant_ener] = (
-                prod_df.loc[rid, pstep_ener] / prod_df.loc[rid, baseline_ener]
-            )
+    if comp_type == "diff":
+        prod_df[quant_ener] = prod_df[baseline_ener] - prod_df[pstep_ener]
+
+    elif comp_type == "norm":
+        prod_df[quant_ener] = prod_df[pstep_ener] / prod_df[baseline_ener]
 
     prod_df.reset_index(inplace=True)
 